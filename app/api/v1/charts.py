@@ -1,10 +1,17 @@
 """
 Version 1 API endpoints for forex charts.
 """
-from typing import Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+import hashlib
+from functools import lru_cache, wraps
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterator, List, Optional, Type
 
+import anyio
+import anyio.to_thread
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, BackgroundTasks, Response
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+
+from ...core.clock import utcnow_coarse
 from ...core.config import get_settings, Settings
 from ...core.exceptions import (
     ForexChartException,
@@ -14,23 +21,139 @@ from ...core.exceptions import (
     ChartGenerationError
 )
 from ...core.logging import get_logger
-from ...models.requests import ChartRequest, HealthCheck
+from ...models.requests import BatchChartRequest, ChartRequest, HealthCheck
 from ...models.responses import ChartResponse, ErrorResponse
-from ...services.chart_service import ChartService
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from ...services.chart_service import ChartService
 
 router = APIRouter(prefix="/v1", tags=["Charts v1"])
 logger = get_logger(__name__)
 
+# Headers for responses that only change with a deploy
+STATIC_CACHE_HEADERS = {"Cache-Control": "public, max-age=86400", "Vary": "Accept-Encoding"}
+
+# HTTP status for each service error; anything else maps to 500
+_STATUS_CODES: Dict[Type[ForexChartException], int] = {
+    DataNotFoundError: 404,
+    InvalidDateRangeError: 400,
+    InvalidCurrencyPairError: 400,
+    ChartGenerationError: 500,
+}
+
+
+def handle_forex_errors(endpoint: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Translate service exceptions raised by a route into HTTP errors."""
+    @wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return await endpoint(*args, **kwargs)
+        except HTTPException:
+            raise
+        except ForexChartException as e:
+            status_code = _STATUS_CODES.get(type(e), 500)
+            if status_code < 500:
+                logger.warning(f"Client error: {e}")
+            else:
+                logger.error(f"Chart generation error: {e}")
+            raise HTTPException(
+                status_code=status_code,
+                detail={
+                    "error_code": e.error_code,
+                    "message": e.message,
+                    "details": dict(e.details)
+                }
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail={
+                    "error_code": "INTERNAL_ERROR",
+                    "message": "An unexpected error occurred",
+                    "details": {"error": str(e)}
+                }
+            )
+    
+    return wrapper
+
+
+def _etag(payload: bytes) -> str:
+    """Build a strong ETag from a payload."""
+    return '"' + hashlib.md5(payload).hexdigest() + '"'
+
+
+# Static payloads are serialized once at import time
+_SUPPORTED_PAIRS_JSON = orjson.dumps({
+    "major_pairs": [
+        "EUR/USD", "GBP/USD", "USD/JPY", "USD/CHF",
+        "AUD/USD", "USD/CAD", "NZD/USD"
+    ],
+    "cross_pairs": [
+        "EUR/GBP", "EUR/JPY", "GBP/JPY", "AUD/JPY",
+        "EUR/CHF", "GBP/CHF", "CHF/JPY"
+    ],
+    "note": "Other pairs may be available. The API automatically tries multiple ticker formats."
+})
+_SUPPORTED_PAIRS_ETAG = _etag(_SUPPORTED_PAIRS_JSON)
+
+_INTERVALS_JSON = orjson.dumps({
+    "intervals": [
+        {"code": "1m", "description": "1 minute"},
+        {"code": "5m", "description": "5 minutes"},
+        {"code": "15m", "description": "15 minutes"},
+        {"code": "30m", "description": "30 minutes"},
+        {"code": "1h", "description": "1 hour"},
+        {"code": "1d", "description": "1 day"}
+    ],
+    "default": "5m",
+    "note": "Shorter intervals may have limited historical data availability."
+})
+_INTERVALS_ETAG = _etag(_INTERVALS_JSON)
+
+
+def get_chart_service() -> "ChartService":
+    """Dependency to get the shared chart service instance."""
+    # Imported lazily so pandas loads on the first chart request, not at startup
+    from ...services import chart_service
+    return chart_service.get_chart_service()
+
 
-def get_chart_service() -> ChartService:
-    """Dependency to get chart service instance."""
-    return ChartService()
+@lru_cache(maxsize=1)
+def _batch_limiter() -> anyio.CapacityLimiter:
+    """Worker threads reserved for batch downloads.
+    
+    Batch calls get their own limiter so they can't use up the default one,
+    which FastAPI also needs for sync dependencies on every other route.
+    """
+    # Created on first use because the limiter needs a running event loop
+    return anyio.CapacityLimiter(get_settings().worker_threads)
+
+
+def chart_cache_control(settings: Settings) -> str:
+    """Let clients and proxies reuse chart responses as long as the server cache does."""
+    return f"public, max-age={settings.chart_cache_ttl}"
+
+
+def chart_etag(request: ChartRequest, generate_interactive: bool) -> str:
+    """Build a strong ETag from the parameters that determine a chart response."""
+    key = "|".join((
+        request.pairs,
+        request.start_date_time,
+        request.end_date_time,
+        request.interval,
+        ",".join(request.indicators),
+        "interactive" if generate_interactive else "data-only"
+    ))
+    return _etag(key.encode())
 
 
 @router.post(
     "/charts",
     response_model=ChartResponse,
     responses={
+        304: {"description": "Not Modified"},
         400: {"model": ErrorResponse, "description": "Bad Request"},
         404: {"model": ErrorResponse, "description": "Data Not Found"},
         500: {"model": ErrorResponse, "description": "Internal Server Error"}
@@ -38,9 +161,13 @@ def get_chart_service() -> ChartService:
     summary="Generate Forex Chart",
     description="Generate an interactive forex chart with historical data"
 )
+@handle_forex_errors
 async def create_chart(
     request: ChartRequest,
-    chart_service: ChartService = Depends(get_chart_service)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    chart_service: "ChartService" = Depends(get_chart_service),
+    settings: Settings = Depends(get_settings)
 ) -> ChartResponse:
     """
     Generate a forex chart for the specified currency pair and date range.
@@ -49,48 +176,24 @@ async def create_chart(
     - **start_date_time**: Start date and time 
     - **end_date_time**: End date and time
     - **interval**: Data interval (1m, 5m, 15m, 30m, 1h, 1d)
+    
+    Send the previously returned `ETag` in `If-None-Match` to get a 304 for repeat requests.
     """
-    try:
-        logger.info(f"Creating chart for {request.pairs}")
-        result = chart_service.generate_chart(request, generate_interactive=True)
-        return result
-        
-    except (DataNotFoundError, InvalidDateRangeError, InvalidCurrencyPairError) as e:
-        logger.warning(f"Client error: {e}")
-        raise HTTPException(
-            status_code=400 if isinstance(e, (InvalidDateRangeError, InvalidCurrencyPairError)) else 404,
-            detail={
-                "error_code": e.error_code,
-                "message": e.message,
-                "details": e.details
-            }
-        )
-    except ChartGenerationError as e:
-        logger.error(f"Chart generation error: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "error_code": e.error_code,
-                "message": e.message,
-                "details": e.details
-            }
-        )
-    except Exception as e:
-        logger.error(f"Unexpected error: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "error_code": "INTERNAL_ERROR",
-                "message": "An unexpected error occurred",
-                "details": {"error": str(e)}
-            }
-        )
+    etag = chart_etag(request, generate_interactive=True)
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = chart_cache_control(settings)
+    
+    logger.info(f"Creating chart for {request.pairs}")
+    return await chart_service.generate_chart_async(request, generate_interactive=True)
 
 
 @router.post(
     "/charts/data-only",
     response_model=ChartResponse,
     responses={
+        304: {"description": "Not Modified"},
         400: {"model": ErrorResponse, "description": "Bad Request"},
         404: {"model": ErrorResponse, "description": "Data Not Found"},
         500: {"model": ErrorResponse, "description": "Internal Server Error"}
@@ -98,40 +201,97 @@ async def create_chart(
     summary="Get Chart Data Only",
     description="Get chart data without generating interactive chart"
 )
+@handle_forex_errors
 async def get_chart_data(
     request: ChartRequest,
-    chart_service: ChartService = Depends(get_chart_service)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    chart_service: "ChartService" = Depends(get_chart_service),
+    settings: Settings = Depends(get_settings)
 ) -> ChartResponse:
     """
     Get chart data for the specified currency pair and date range without generating interactive chart.
     
     This endpoint is useful when you only need the raw data for analysis.
     """
-    try:
-        logger.info(f"Getting chart data for {request.pairs}")
-        result = chart_service.generate_chart(request, generate_interactive=False)
-        return result
-        
-    except (DataNotFoundError, InvalidDateRangeError, InvalidCurrencyPairError) as e:
-        logger.warning(f"Client error: {e}")
-        raise HTTPException(
-            status_code=400 if isinstance(e, (InvalidDateRangeError, InvalidCurrencyPairError)) else 404,
-            detail={
-                "error_code": e.error_code,
-                "message": e.message,
-                "details": e.details
-            }
-        )
-    except Exception as e:
-        logger.error(f"Unexpected error: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "error_code": "INTERNAL_ERROR",
-                "message": "An unexpected error occurred",
-                "details": {"error": str(e)}
-            }
-        )
+    etag = chart_etag(request, generate_interactive=False)
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = chart_cache_control(settings)
+    
+    logger.info(f"Getting chart data for {request.pairs}")
+    return await chart_service.generate_chart_async(request, generate_interactive=False)
+
+
+def _ndjson_candles(ohlc: "pd.DataFrame") -> Iterator[bytes]:
+    """Encode candlesticks one JSON object per line."""
+    # Convert each column to Python scalars in one pass rather than row by row
+    columns = (ohlc[name].tolist() for name in ("open", "high", "low", "close"))
+    for t, o, h, l, c in zip(ohlc.index.as_unit("ms").asi8.tolist(), *columns):
+        yield orjson.dumps({"time": t, "open": o, "high": h, "low": l, "close": c}) + b"\n"
+
+
+@router.post(
+    "/charts/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}, "description": "One candlestick per line"},
+        400: {"model": ErrorResponse, "description": "Bad Request"},
+        404: {"model": ErrorResponse, "description": "Data Not Found"},
+        500: {"model": ErrorResponse, "description": "Internal Server Error"}
+    },
+    summary="Stream Chart Data",
+    description="Stream candlesticks as newline-delimited JSON"
+)
+@handle_forex_errors
+async def stream_chart_data(
+    request: ChartRequest,
+    chart_service: "ChartService" = Depends(get_chart_service)
+) -> StreamingResponse:
+    """
+    Stream candlesticks for the specified currency pair and date range.
+    
+    Each line is a JSON object with `time` (epoch milliseconds, UTC), `open`,
+    `high`, `low` and `close`, so clients can start parsing large ranges
+    before the whole payload has been encoded.
+    """
+    logger.info(f"Streaming chart data for {request.pairs}")
+    ohlc = await chart_service.get_candles_async(request)
+    return StreamingResponse(_ndjson_candles(ohlc), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/charts/batch",
+    response_model=List[ChartResponse],
+    responses={
+        400: {"model": ErrorResponse, "description": "Bad Request"},
+        404: {"model": ErrorResponse, "description": "Data Not Found"},
+        500: {"model": ErrorResponse, "description": "Internal Server Error"}
+    },
+    summary="Get Chart Data for Multiple Pairs",
+    description="Get chart data for several currency pairs with batched data downloads"
+)
+@handle_forex_errors
+async def get_chart_data_batch(
+    request: BatchChartRequest,
+    response: Response,
+    chart_service: "ChartService" = Depends(get_chart_service),
+    settings: Settings = Depends(get_settings)
+) -> List[ChartResponse]:
+    """
+    Get chart data for several currency pairs over the same date range.
+    
+    Pairs are downloaded together (up to 20 symbols per upstream request),
+    which is much faster than calling `/charts/data-only` once per pair.
+    """
+    response.headers["Cache-Control"] = chart_cache_control(settings)
+    
+    logger.info(f"Getting batch chart data for {request.pairs_list}")
+    # The service stays synchronous; the worker thread keeps the event loop free during downloads
+    return await anyio.to_thread.run_sync(
+        chart_service.generate_charts_batch, request, limiter=_batch_limiter()
+    )
 
 
 @router.get(
@@ -140,12 +300,15 @@ async def get_chart_data(
     summary="Health Check",
     description="Check API health status"
 )
-async def health_check(settings: Settings = Depends(get_settings)) -> HealthCheck:
+async def health_check(settings: Settings = Depends(get_settings)) -> ORJSONResponse:
     """Check the health status of the API."""
-    return HealthCheck(
-        status="healthy",
-        version=settings.api_version
-    )
+    # Health probes are frequent; build the payload directly instead of validating a HealthCheck
+    return ORJSONResponse({
+        "status": "healthy",
+        "timestamp": utcnow_coarse(),
+        "version": settings.api_version,
+        "uptime": None
+    })
 
 
 @router.get(
@@ -153,19 +316,13 @@ async def health_check(settings: Settings = Depends(get_settings)) -> HealthChec
     summary="Get Supported Currency Pairs",
     description="Get list of commonly supported currency pairs"
 )
-async def get_supported_pairs() -> Dict[str, Any]:
+async def get_supported_pairs() -> Response:
     """Get list of commonly supported currency pairs."""
-    return {
-        "major_pairs": [
-            "EUR/USD", "GBP/USD", "USD/JPY", "USD/CHF",
-            "AUD/USD", "USD/CAD", "NZD/USD"
-        ],
-        "cross_pairs": [
-            "EUR/GBP", "EUR/JPY", "GBP/JPY", "AUD/JPY",
-            "EUR/CHF", "GBP/CHF", "CHF/JPY"
-        ],
-        "note": "Other pairs may be available. The API automatically tries multiple ticker formats."
-    }
+    return Response(
+        content=_SUPPORTED_PAIRS_JSON,
+        media_type="application/json",
+        headers={**STATIC_CACHE_HEADERS, "ETag": _SUPPORTED_PAIRS_ETAG}
+    )
 
 
 @router.get(
@@ -173,17 +330,10 @@ async def get_supported_pairs() -> Dict[str, Any]:
     summary="Get Supported Intervals",
     description="Get list of supported data intervals"
 )
-async def get_supported_intervals() -> Dict[str, Any]:
+async def get_supported_intervals() -> Response:
     """Get list of supported data intervals."""
-    return {
-        "intervals": [
-            {"code": "1m", "description": "1 minute"},
-            {"code": "5m", "description": "5 minutes"},
-            {"code": "15m", "description": "15 minutes"},
-            {"code": "30m", "description": "30 minutes"},
-            {"code": "1h", "description": "1 hour"},
-            {"code": "1d", "description": "1 day"}
-        ],
-        "default": "5m",
-        "note": "Shorter intervals may have limited historical data availability."
-    }
\ No newline at end of file
+    return Response(
+        content=_INTERVALS_JSON,
+        media_type="application/json",
+        headers={**STATIC_CACHE_HEADERS, "ETag": _INTERVALS_ETAG}
+    )
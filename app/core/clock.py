@@ -0,0 +1,20 @@
+"""
+Coarse clock helpers for the Forex Chart API.
+"""
+import time
+from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def _utc_datetime(second: int) -> datetime:
+    return datetime.utcfromtimestamp(second)
+
+
+def utcnow_coarse() -> datetime:
+    """Get the current UTC time truncated to the second.
+    
+    The datetime is built once per second and shared by every caller within
+    that second, which keeps response timestamps cheap on hot endpoints.
+    """
+    return _utc_datetime(int(time.time()))
@@ -20,6 +20,7 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     reload: bool = False
+    worker_threads: int = 16
     
     # Chart Configuration
     default_interval: str = "5m"
@@ -31,6 +32,13 @@ class Settings(BaseSettings):
     # Data Source Configuration
     yfinance_timeout: int = 30
     max_data_points: int = 10000
+    max_concurrent_downloads: int = 10
+    
+    # Cache Configuration
+    chart_cache_ttl: int = 60
+    chart_cache_max_size: int = 512
+    cache_enabled: bool = True
+    cache_dir: str = "~/.cache/forex-analyzer"
     
     # CORS Configuration
     cors_origins: list = ["*"]
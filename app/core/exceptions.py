@@ -1,7 +1,11 @@
 """
 Custom exceptions for the Forex Chart API.
 """
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+# Shared read-only default so exceptions without details don't allocate a dict
+_EMPTY_DETAILS: Mapping[str, Any] = MappingProxyType({})
 
 
 class ForexChartException(Exception):
@@ -15,7 +19,7 @@ class ForexChartException(Exception):
     ):
         self.message = message
         self.error_code = error_code
-        self.details = details or {}
+        self.details: Mapping[str, Any] = details if details is not None else _EMPTY_DETAILS
         super().__init__(self.message)
 
 
@@ -1,30 +1,55 @@
 """
 Logging configuration for the Forex Chart API.
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from .config import get_settings
 
+# Records are handed to a background thread so request handlers never block on stdout
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
 
 def setup_logging() -> None:
     """Set up logging configuration."""
+    global _queue_listener
     settings = get_settings()
     
     logging.basicConfig(
         level=getattr(logging, settings.log_level),
         format=settings.log_format,
         handlers=[
-            logging.StreamHandler(sys.stdout),
+            logging.handlers.QueueHandler(_log_queue),
         ]
     )
     
+    if _queue_listener is None:
+        _queue_listener = logging.handlers.QueueListener(
+            _log_queue,
+            logging.StreamHandler(sys.stdout),
+            respect_handler_level=True
+        )
+        _queue_listener.start()
+        atexit.register(shutdown_logging)
+    
     # Set third-party loggers to WARNING to reduce noise
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("yfinance").setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """Flush queued log records and stop the background writer thread."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance."""
     return logging.getLogger(name)
@@ -35,4 +60,4 @@ class LoggerMixin:
     
     @property
     def logger(self) -> logging.Logger:
-        return get_logger(self.__class__.__name__)
\ No newline at end of file
+        return get_logger(self.__class__.__name__)
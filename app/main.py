@@ -1,15 +1,19 @@
 """
 Main FastAPI application.
 """
+import asyncio
+import hashlib
+import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 
 from .api import api_router
 from .core.config import get_settings
-from .core.logging import setup_logging, get_logger
+from .core.logging import setup_logging, shutdown_logging, get_logger
 from .core.exceptions import ForexChartException
 
 # Setup logging
@@ -24,15 +28,30 @@ app_start_time = time.time()
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
+    setup_logging()
     logger.info("🚀 Forex Chart API is starting up...")
     settings = get_settings()
     logger.info(f"📊 API Version: {settings.api_version}")
     logger.info(f"🔧 Debug Mode: {settings.debug}")
     
+    # Bounded pool for blocking chart work offloaded with asyncio.to_thread
+    executor = ThreadPoolExecutor(
+        max_workers=settings.worker_threads,
+        thread_name_prefix="forex-chart"
+    )
+    asyncio.get_running_loop().set_default_executor(executor)
+    
+    # Compile the indicator kernels now rather than on the first chart request;
+    # imported here so that importing the app doesn't load numba
+    from .services.ta_numba import warm_up
+    await asyncio.to_thread(warm_up)
+    
     yield
     
     # Shutdown
     logger.info("👋 Forex Chart API is shutting down...")
+    executor.shutdown(wait=False)
+    shutdown_logging()
 
 
 def create_app() -> FastAPI:
@@ -45,15 +64,17 @@ def create_app() -> FastAPI:
         version=settings.api_version,
         debug=settings.debug,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json"
     )
     
-    # Add CORS middleware
+    # Add CORS middleware. Requests without an Origin header already bypass it;
+    # a frozenset makes the allowed-origin check a hash lookup instead of a list scan.
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.cors_origins,
+        allow_origins=frozenset(settings.cors_origins),
         allow_credentials=settings.cors_allow_credentials,
         allow_methods=settings.cors_allow_methods,
         allow_headers=settings.cors_allow_headers,
@@ -62,21 +83,80 @@ def create_app() -> FastAPI:
     # Add request logging middleware
     @app.middleware("http")
     async def log_requests(request: Request, call_next):
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # Log request
-        logger.info(f"📨 {request.method} {request.url.path}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📨 {request.method} {request.url.path}")
         
         # Process request
         response = await call_next(request)
         
-        # Log response
-        process_time = time.time() - start_time
-        logger.info(
-            f"📤 {request.method} {request.url.path} - "
-            f"Status: {response.status_code} - "
-            f"Time: {process_time:.3f}s"
+        # Log response, skipping the formatting entirely when INFO is filtered out
+        if logger.isEnabledFor(logging.INFO):
+            process_time = (time.perf_counter_ns() - start_ns) / 1e9
+            logger.info(
+                f"📤 {request.method} {request.url.path} - "
+                f"Status: {response.status_code} - "
+                f"Time: {process_time:.3f}s"
+            )
+        
+        return response
+    
+    # Add ETag middleware so repeated GETs can be answered with 304 Not Modified
+    @app.middleware("http")
+    async def etag_responses(request: Request, call_next):
+        response = await call_next(request)
+        
+        if request.method != "GET" or not 200 <= response.status_code < 300:
+            return response
+        
+        # Routes may precompute their ETag; only hash the body when they don't
+        etag = response.headers.get("etag")
+        body = None
+        if etag is None:
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            response.headers["ETag"] = etag
+        
+        if request.headers.get("if-none-match") == etag:
+            # A 304 must repeat the caching headers the full response would have sent
+            not_modified_headers = {"ETag": etag}
+            for name in ("Cache-Control", "Vary"):
+                if name in response.headers:
+                    not_modified_headers[name] = response.headers[name]
+            return Response(status_code=304, headers=not_modified_headers)
+        
+        if body is None:
+            return response
+        
+        return Response(
+            content=body,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            media_type=response.media_type
         )
+    
+    # Add Cache-Control headers for the docs, which FastAPI serves itself; API routes set
+    # their own. Outermost so 304 responses carry them too
+    docs_cache_control = "public, max-age=3600"
+    cache_control_by_path = {
+        app.openapi_url: docs_cache_control,
+        app.docs_url: docs_cache_control,
+        app.redoc_url: docs_cache_control,
+    }
+    
+    @app.middleware("http")
+    async def cache_headers(request: Request, call_next):
+        response = await call_next(request)
+        
+        if response.status_code >= 400:
+            response.headers["Cache-Control"] = "no-store"
+        elif request.method == "GET":
+            cache_control = cache_control_by_path.get(request.url.path)
+            if cache_control is not None:
+                response.headers["Cache-Control"] = cache_control
+                response.headers["Vary"] = "Accept-Encoding"
         
         return response
     
@@ -90,7 +170,7 @@ def create_app() -> FastAPI:
                 "success": False,
                 "error_code": exc.error_code,
                 "message": exc.message,
-                "details": exc.details
+                "details": dict(exc.details)
             }
         )
     
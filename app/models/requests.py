@@ -1,10 +1,83 @@
 """
 Request models for the Forex Chart API.
 """
+import re
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional
 from pydantic import BaseModel, field_validator, Field
 
+from ..core.clock import utcnow_coarse
+
+DATETIME_FORMATS = (
+    "%Y-%m-%d %I:%M %p",    # 2025-08-25 10:00 AM
+    "%Y-%m-%d %H:%M",       # 2025-08-25 10:00 (24-hour)
+    "%Y-%m-%d %I:%M%p",     # 2025-08-25 10:00AM (no space)
+)
+
+SUPPORTED_INTERVALS = ['1m', '5m', '15m', '30m', '1h', '1d']
+_SUPPORTED_INTERVALS = frozenset(SUPPORTED_INTERVALS)
+
+SUPPORTED_INDICATORS = ['heikin_ashi', 'ema_20', 'ema_50', 'ema_200']
+
+# Each pair can expand to three ticker formats, so this keeps a batch to a few downloads
+MAX_BATCH_PAIRS = 20
+
+_PAIR_RE = re.compile(r'([A-Za-z]{3})/([A-Za-z]{3})')
+
+# Matches all supported formats so the common case skips strptime
+_DATETIME_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2}) (\d{1,2}):(\d{2})(?: ?([AaPp][Mm]))?')
+
+
+@lru_cache(maxsize=1024)
+def parse_datetime(value: str) -> datetime:
+    """Parse a datetime string in any of the supported formats.
+    
+    Results are memoized: each request string is parsed once by the validator
+    and again by the service, and clients tend to repeat the same ranges.
+    """
+    match = _DATETIME_RE.fullmatch(value)
+    if match:
+        year, month, day, hour, minute, meridiem = match.groups()
+        hour = int(hour)
+        if meridiem is None:
+            return datetime(int(year), int(month), int(day), hour, int(minute))
+        if 1 <= hour <= 12:
+            hour = hour % 12 + (12 if meridiem.upper() == "PM" else 0)
+            return datetime(int(year), int(month), int(day), hour, int(minute))
+    
+    # Fall back to strptime for inputs the fast path doesn't cover
+    for fmt in DATETIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    
+    raise ValueError(f"Unable to parse datetime: {value}")
+
+
+def _validate_pair(v: str) -> str:
+    match = _PAIR_RE.fullmatch(v)
+    if not match:
+        raise ValueError('Currency pair must be BASE/QUOTE with 3-letter codes (e.g., EUR/USD)')
+    return f"{match.group(1).upper()}/{match.group(2).upper()}"
+
+
+def _validate_interval(v: str) -> str:
+    if v not in _SUPPORTED_INTERVALS:
+        raise ValueError(f'interval must be one of {SUPPORTED_INTERVALS}')
+    return v
+
+
+def _validate_datetime_format(v: str) -> str:
+    try:
+        parse_datetime(v)
+    except ValueError:
+        raise ValueError(
+            "Datetime format must be 'YYYY-MM-DD HH:MM AM/PM' or 'YYYY-MM-DD HH:MM'"
+        )
+    return v
+
 
 class ChartRequest(BaseModel):
     """Request model for chart generation."""
@@ -29,53 +102,83 @@ class ChartRequest(BaseModel):
         description="Data interval",
         example="5m"
     )
+    indicators: List[str] = Field(
+        default_factory=list,
+        description=f"Indicators to compute alongside the candles, any of {SUPPORTED_INDICATORS}",
+        example=["heikin_ashi", "ema_20"]
+    )
     
     @field_validator('pairs')
     @classmethod
     def validate_pairs(cls, v):
-        if '/' not in v:
-            raise ValueError('Currency pair must contain "/" (e.g., EUR/USD)')
-        parts = v.split('/')
-        if len(parts) != 2:
-            raise ValueError('Currency pair must have exactly one "/" separator')
-        base, quote = parts
-        if len(base) != 3 or len(quote) != 3:
-            raise ValueError('Each currency code must be exactly 3 characters')
-        return v.upper()
+        return _validate_pair(v)
+    
+    @field_validator('indicators')
+    @classmethod
+    def validate_indicators(cls, v):
+        unknown = [name for name in v if name not in SUPPORTED_INDICATORS]
+        if unknown:
+            raise ValueError(f'indicators must be among {SUPPORTED_INDICATORS}, got {unknown}')
+        return list(dict.fromkeys(v))
     
     @field_validator('interval')
     @classmethod
     def validate_interval(cls, v):
-        allowed_intervals = ['1m', '5m', '15m', '30m', '1h', '1d']
-        if v not in allowed_intervals:
-            raise ValueError(f'interval must be one of {allowed_intervals}')
-        return v
+        return _validate_interval(v)
     
     @field_validator('start_date_time', 'end_date_time')
     @classmethod
     def validate_datetime_format(cls, v):
-        formats = [
-            "%Y-%m-%d %I:%M %p",    # 2025-08-25 10:00 AM
-            "%Y-%m-%d %H:%M",       # 2025-08-25 10:00 (24-hour)
-            "%Y-%m-%d %I:%M%p",     # 2025-08-25 10:00AM (no space)
-        ]
-        
-        for fmt in formats:
-            try:
-                datetime.strptime(v, fmt)
-                return v
-            except ValueError:
-                continue
-        
-        raise ValueError(
-            "Datetime format must be 'YYYY-MM-DD HH:MM AM/PM' or 'YYYY-MM-DD HH:MM'"
-        )
+        return _validate_datetime_format(v)
+
+
+class BatchChartRequest(BaseModel):
+    """Request model for fetching chart data for several pairs at once."""
+    
+    pairs_list: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_PAIRS,
+        description=f"Currency pairs in format 'BASE/QUOTE', at most {MAX_BATCH_PAIRS}",
+        example=["EUR/USD", "GBP/USD"]
+    )
+    start_date_time: str = Field(
+        ...,
+        description="Start datetime in format 'YYYY-MM-DD HH:MM AM/PM' or 'YYYY-MM-DD HH:MM'",
+        example="2025-08-25 10:00 AM"
+    )
+    end_date_time: str = Field(
+        ...,
+        description="End datetime in format 'YYYY-MM-DD HH:MM AM/PM' or 'YYYY-MM-DD HH:MM'",
+        example="2025-08-26 10:00 AM"
+    )
+    interval: str = Field(
+        default="5m",
+        description="Data interval",
+        example="5m"
+    )
+    
+    @field_validator('pairs_list')
+    @classmethod
+    def validate_pairs_list(cls, v):
+        # Drop duplicates while keeping the requested order
+        return list(dict.fromkeys(_validate_pair(pair) for pair in v))
+    
+    @field_validator('interval')
+    @classmethod
+    def validate_interval(cls, v):
+        return _validate_interval(v)
+    
+    @field_validator('start_date_time', 'end_date_time')
+    @classmethod
+    def validate_datetime_format(cls, v):
+        return _validate_datetime_format(v)
 
 
 class HealthCheck(BaseModel):
     """Health check response model."""
     
     status: str = Field(default="healthy", description="Service status")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Check timestamp")
+    timestamp: datetime = Field(default_factory=utcnow_coarse, description="Check timestamp")
     version: str = Field(description="API version")
     uptime: Optional[float] = Field(None, description="Service uptime in seconds")
\ No newline at end of file
@@ -1,31 +1,90 @@
 """
 Response models for the Forex Chart API.
 """
-from datetime import datetime
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+from typing import Annotated, List, Dict, Any, NamedTuple, Optional
+import numpy as np
+from pydantic import BaseModel, Field, PlainSerializer, PlainValidator, WithJsonSchema
 
+from ..core.clock import utcnow_coarse
 
-class CandleData(BaseModel):
+
+def _ndarray_type(dtype: type, item_type: str) -> Any:
+    """1-D ndarray field that accepts any sequence and serializes as a JSON list."""
+    return Annotated[
+        np.ndarray,
+        PlainValidator(lambda v: np.asarray(v, dtype=dtype)),
+        PlainSerializer(lambda a: a.tolist(), return_type=list),
+        WithJsonSchema({"type": "array", "items": {"type": item_type}}),
+    ]
+
+
+FloatArray = _ndarray_type(np.float64, "number")
+Int64Array = _ndarray_type(np.int64, "integer")
+
+
+class PriceRange(NamedTuple):
+    """Lowest and highest price over a chart's candles."""
+    
+    min: float
+    max: float
+
+
+# Serialized as an object so clients keep receiving {"min": ..., "max": ...}
+PriceRangeField = Annotated[
+    PriceRange,
+    PlainSerializer(lambda r: r._asdict(), return_type=dict),
+    WithJsonSchema({
+        "type": "object",
+        "properties": {"min": {"type": "number"}, "max": {"type": "number"}},
+        "required": ["min", "max"],
+    }),
+]
+
+
+class CandleData(NamedTuple):
     """Individual candlestick data point."""
     
-    time: datetime = Field(description="Candlestick timestamp")
-    open: float = Field(description="Opening price")
-    high: float = Field(description="Highest price")
-    low: float = Field(description="Lowest price")
-    close: float = Field(description="Closing price")
+    time: datetime
+    open: float
+    high: float
+    low: float
+    close: float
 
 
 class ChartData(BaseModel):
-    """Chart data response."""
+    """Chart data response with candlesticks stored as parallel columns."""
     
     pairs: str = Field(description="Currency pair")
     start_date: datetime = Field(description="Data start date")
     end_date: datetime = Field(description="Data end date")
     interval: str = Field(description="Data interval")
     data_points: int = Field(description="Number of data points")
-    price_range: Dict[str, float] = Field(description="Price range (min/max)")
-    candles: List[CandleData] = Field(description="Candlestick data")
+    price_range: PriceRangeField = Field(description="Price range (min/max)")
+    times: Int64Array = Field(description="Candlestick timestamps (epoch milliseconds, UTC)")
+    open: FloatArray = Field(description="Opening prices")
+    high: FloatArray = Field(description="Highest prices")
+    low: FloatArray = Field(description="Lowest prices")
+    close: FloatArray = Field(description="Closing prices")
+    indicators: Dict[str, FloatArray] = Field(
+        default_factory=dict,
+        description="Indicator series aligned with the candles, keyed by series name"
+    )
+    
+    @property
+    def candles(self) -> List[CandleData]:
+        """Candlesticks as individual data points."""
+        # The columns are already validated float64/int64 arrays, so no per-candle validation
+        return [
+            CandleData(datetime.fromtimestamp(t / 1000, tz=timezone.utc), o, h, l, c)
+            for t, o, h, l, c in zip(
+                self.times.tolist(),
+                self.open.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist()
+            )
+        ]
 
 
 class ChartResponse(BaseModel):
@@ -46,7 +105,7 @@ class ErrorResponse(BaseModel):
     error_code: str = Field(description="Error code")
     message: str = Field(description="Error message")
     details: Dict[str, Any] = Field(default_factory=dict, description="Error details")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Error timestamp")
+    timestamp: datetime = Field(default_factory=utcnow_coarse, description="Error timestamp")
 
 
 class ChartMetrics(BaseModel):
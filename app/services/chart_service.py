@@ -1,26 +1,56 @@
 """
 Chart service for generating interactive forex charts.
 """
+import asyncio
+import hashlib
+import threading
 import time
 import os
 import platform
-import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Any, Sequence, Tuple, Optional
+import numpy as np
 import pandas as pd
-import yfinance as yf
-from lightweight_charts import Chart
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from cachetools import TTLCache
 
 from ..core.config import get_settings
 from ..core.exceptions import (
+    ForexChartException,
     DataNotFoundError,
     InvalidDateRangeError,
     InvalidCurrencyPairError,
     ChartGenerationError
 )
 from ..core.logging import LoggerMixin
-from ..models.requests import ChartRequest
-from ..models.responses import ChartData, ChartResponse, CandleData, ChartMetrics
+from ..models.requests import BatchChartRequest, ChartRequest, parse_datetime
+from ..models.responses import ChartData, ChartResponse, ChartMetrics, PriceRange
+
+# Yahoo accepts at most this many symbols in one multi-ticker request
+MAX_SYMBOLS_PER_DOWNLOAD = 20
+
+# Price columns kept from yfinance downloads, in candle order
+OHLC_COLUMNS = ["Open", "High", "Low", "Close"]
+
+# Seconds a Parquet disk-cache entry stays valid, by interval
+DISK_CACHE_TTL = {
+    "1m": 3600,
+    "5m": 3600,
+    "15m": 3600,
+    "30m": 3600,
+    "1h": 86400,
+    "1d": 604800,
+}
+
+
+@lru_cache(maxsize=128)
+def _pair_slug(pairs: str) -> str:
+    """Filesystem-safe form of a currency pair, e.g. EUR_USD."""
+    return pairs.replace('/', '_')
 
 
 class ChartService(LoggerMixin):
@@ -28,6 +58,25 @@ class ChartService(LoggerMixin):
     
     def __init__(self):
         self.settings = get_settings()
+        self._chart_cache: TTLCache = TTLCache(
+            maxsize=self.settings.chart_cache_max_size,
+            ttl=self.settings.chart_cache_ttl
+        )
+        self._cache_lock = threading.RLock()
+        # Caps concurrent yfinance downloads across request threads
+        self._download_slots = threading.BoundedSemaphore(
+            self.settings.max_concurrent_downloads
+        )
+        # Background writer for CSV exports so responses don't wait on disk
+        self._io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="forex-io")
+        # Ticker format that last returned data, per currency pair
+        self._symbol_cache: Dict[str, str] = {}
+    
+    def reset(self) -> None:
+        """Forget cached charts and learned ticker formats."""
+        with self._cache_lock:
+            self._chart_cache.clear()
+        self._symbol_cache.clear()
     
     def generate_chart(
         self, 
@@ -37,6 +86,9 @@ class ChartService(LoggerMixin):
         """
         Generate a forex chart based on the request parameters.
         
+        Responses are memoized for `chart_cache_ttl` seconds so repeated
+        requests skip the data download and chart rendering.
+        
         Args:
             request: Chart generation request
             generate_interactive: Whether to generate an interactive chart
@@ -44,6 +96,12 @@ class ChartService(LoggerMixin):
         Returns:
             ChartResponse with chart data and metadata
         """
+        cache_key = self._cache_key(request, generate_interactive)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            self.logger.debug(f"Serving cached chart for {request.pairs}")
+            return cached
+        
         start_time = time.time()
         
         try:
@@ -65,58 +123,222 @@ class ChartService(LoggerMixin):
             )
             fetch_time = time.time() - fetch_start_time
             
-            # Process data for chart
-            chart_data = self._process_chart_data(df, request.pairs, start_dt, end_dt, request.interval)
+            response = self._build_chart_response(
+                request, df, start_dt, end_dt, generate_interactive, fetch_time, start_time
+            )
             
-            # Generate interactive chart if requested
-            chart_url = None
-            csv_filename = None
+        except Exception as e:
+            raise self._generation_error(request, e)
+        
+        self._store_cached(cache_key, response)
+        return response
+    
+    async def generate_chart_async(
+        self, 
+        request: ChartRequest, 
+        generate_interactive: bool = True
+    ) -> ChartResponse:
+        """
+        Generate a forex chart without blocking the event loop.
+        
+        Runs `generate_chart` in a worker thread. The candidate tickers are
+        still probed concurrently, and the highest-priority one that returned
+        data is kept.
+        
+        Args:
+            request: Chart generation request
+            generate_interactive: Whether to generate an interactive chart
             
-            if generate_interactive:
-                chart_gen_start_time = time.time()
-                chart_url, csv_filename = self._generate_interactive_chart(
-                    df, 
-                    request.pairs, 
-                    start_dt, 
-                    end_dt
-                )
-                chart_gen_time = time.time() - chart_gen_start_time
-            else:
-                chart_gen_time = 0
+        Returns:
+            ChartResponse with chart data and metadata
+        """
+        # Cache hits are answered on the event loop without a thread hop
+        cached = self._get_cached(self._cache_key(request, generate_interactive))
+        if cached is not None:
+            return cached
+        
+        # Same code path as generate_chart, so the two can't drift apart
+        return await asyncio.to_thread(self.generate_chart, request, generate_interactive)
+    
+    async def get_candles_async(self, request: ChartRequest) -> pd.DataFrame:
+        """
+        Fetch the candlesticks for a request without building a ChartResponse.
+        
+        Args:
+            request: Chart request
             
-            total_time = time.time() - start_time
+        Returns:
+            DataFrame with open/high/low/close columns indexed by timestamp
+        """
+        start_dt, end_dt = self._parse_date_range(
+            request.start_date_time,
+            request.end_date_time
+        )
+        df = await asyncio.to_thread(
+            self._fetch_market_data,
+            request.pairs,
+            start_dt,
+            end_dt,
+            request.interval
+        )
+        # Trim to the requested window, exactly as _process_chart_data does for /charts
+        return self._ohlc_frame(self._slice_window(df, start_dt, end_dt))
+    
+    @staticmethod
+    def _cache_key(request: ChartRequest, generate_interactive: bool) -> Tuple[Any, ...]:
+        return (
+            request.pairs,
+            request.start_date_time,
+            request.end_date_time,
+            request.interval,
+            tuple(request.indicators),
+            generate_interactive
+        )
+    
+    def _get_cached(self, key: Tuple[Any, ...]) -> Optional[ChartResponse]:
+        with self._cache_lock:
+            return self._chart_cache.get(key)
+    
+    def _store_cached(self, key: Tuple[Any, ...], response: ChartResponse) -> None:
+        with self._cache_lock:
+            self._chart_cache[key] = response
+    
+    def _generation_error(self, request: ChartRequest, error: Exception) -> ChartGenerationError:
+        """Wrap a failure during chart generation."""
+        self.logger.error(f"Chart generation failed: {str(error)}")
+        return ChartGenerationError(
+            message=f"Failed to generate chart: {str(error)}",
+            details={
+                "pairs": request.pairs,
+                "start_date": request.start_date_time,
+                "end_date": request.end_date_time,
+                "interval": request.interval
+            }
+        )
+    
+    def _build_chart_response(
+        self,
+        request: ChartRequest,
+        df: pd.DataFrame,
+        start_dt: datetime,
+        end_dt: datetime,
+        generate_interactive: bool,
+        fetch_time: float,
+        start_time: float
+    ) -> ChartResponse:
+        """Process fetched data and optionally render the interactive chart."""
+        # Process data for chart
+        chart_data = self._process_chart_data(
+            df, request.pairs, start_dt, end_dt, request.interval, request.indicators
+        )
+        
+        # Generate interactive chart if requested
+        chart_url = None
+        csv_filename = None
+        
+        if generate_interactive:
+            chart_gen_start_time = time.time()
+            chart_url, csv_filename = self._generate_interactive_chart(
+                df, 
+                request.pairs, 
+                start_dt, 
+                end_dt,
+                request.interval
+            )
+            chart_gen_time = time.time() - chart_gen_start_time
+        else:
+            chart_gen_time = 0
+        
+        total_time = time.time() - start_time
+        
+        # Create metrics
+        metrics = ChartMetrics(
+            data_fetch_time=fetch_time,
+            chart_generation_time=chart_gen_time,
+            total_time=total_time,
+            data_points_processed=len(df)
+        )
+        
+        self.logger.info(f"Chart generated successfully in {total_time:.2f}s with {len(df)} data points")
+        
+        return ChartResponse(
+            message=f"Chart created successfully for {request.pairs}",
+            chart_data=chart_data,
+            chart_url=chart_url,
+            csv_filename=csv_filename,
+            metadata={
+                "metrics": metrics.dict(),
+                "settings": {
+                    "interval": request.interval,
+                    "data_points": len(df),
+                    "date_range": f"{start_dt} to {end_dt}"
+                }
+            }
+        )
+    
+    def generate_charts_batch(self, request: BatchChartRequest) -> List[ChartResponse]:
+        """
+        Get chart data for several currency pairs with batched downloads.
+        
+        Args:
+            request: Batch chart request
             
-            # Create metrics
-            metrics = ChartMetrics(
-                data_fetch_time=fetch_time,
-                chart_generation_time=chart_gen_time,
-                total_time=total_time,
-                data_points_processed=len(df)
+        Returns:
+            One data-only ChartResponse per requested pair, in request order
+        """
+        start_time = time.time()
+        
+        try:
+            self.logger.info(f"Generating batch chart data for {len(request.pairs_list)} pairs")
+            
+            start_dt, end_dt = self._parse_date_range(
+                request.start_date_time,
+                request.end_date_time
             )
             
-            self.logger.info(f"Chart generated successfully in {total_time:.2f}s with {len(df)} data points")
+            fetch_start_time = time.time()
+            frames = self._fetch_market_data_batch(
+                request.pairs_list,
+                start_dt,
+                end_dt,
+                request.interval
+            )
+            fetch_time = time.time() - fetch_start_time
             
-            return ChartResponse(
-                message=f"Chart created successfully for {request.pairs}",
-                chart_data=chart_data,
-                chart_url=chart_url,
-                csv_filename=csv_filename,
-                metadata={
-                    "metrics": metrics.dict(),
-                    "settings": {
-                        "interval": request.interval,
-                        "data_points": len(df),
-                        "date_range": f"{start_dt} to {end_dt}"
+            responses = []
+            for pairs in request.pairs_list:
+                df = frames[pairs]
+                chart_data = self._process_chart_data(df, pairs, start_dt, end_dt, request.interval)
+                metrics = ChartMetrics(
+                    data_fetch_time=fetch_time,
+                    chart_generation_time=0,
+                    total_time=time.time() - start_time,
+                    data_points_processed=len(df)
+                )
+                responses.append(ChartResponse(
+                    message=f"Chart data retrieved successfully for {pairs}",
+                    chart_data=chart_data,
+                    metadata={
+                        "metrics": metrics.dict(),
+                        "settings": {
+                            "interval": request.interval,
+                            "data_points": len(df),
+                            "date_range": f"{start_dt} to {end_dt}"
+                        }
                     }
-                }
-            )
+                ))
             
+            self.logger.info(f"Batch chart data generated in {time.time() - start_time:.2f}s")
+            return responses
+            
+        except ForexChartException:
+            raise
         except Exception as e:
-            self.logger.error(f"Chart generation failed: {str(e)}")
+            self.logger.error(f"Batch chart generation failed: {str(e)}")
             raise ChartGenerationError(
-                message=f"Failed to generate chart: {str(e)}",
+                message=f"Failed to generate charts: {str(e)}",
                 details={
-                    "pairs": request.pairs,
+                    "pairs_list": request.pairs_list,
                     "start_date": request.start_date_time,
                     "end_date": request.end_date_time,
                     "interval": request.interval
@@ -125,22 +347,11 @@ class ChartService(LoggerMixin):
     
     def _parse_date_range(self, start_str: str, end_str: str) -> Tuple[datetime, datetime]:
         """Parse and validate date range."""
-        formats = [
-            "%Y-%m-%d %I:%M %p",    # 2025-08-25 10:00 AM
-            "%Y-%m-%d %H:%M",       # 2025-08-25 10:00 (24-hour)
-            "%Y-%m-%d %I:%M%p",     # 2025-08-25 10:00AM (no space)
-        ]
-        
-        def parse_datetime(date_str: str) -> datetime:
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
-            raise InvalidDateRangeError(f"Unable to parse datetime: {date_str}")
-        
-        start_dt = parse_datetime(start_str)
-        end_dt = parse_datetime(end_str)
+        try:
+            start_dt = parse_datetime(start_str)
+            end_dt = parse_datetime(end_str)
+        except ValueError as e:
+            raise InvalidDateRangeError(str(e))
         
         if start_dt >= end_dt:
             raise InvalidDateRangeError("Start date must be before end date")
@@ -160,24 +371,128 @@ class ChartService(LoggerMixin):
         end_dt: datetime, 
         interval: str
     ) -> pd.DataFrame:
-        """Fetch market data from Yahoo Finance."""
+        """Fetch market data from Yahoo Finance, probing all candidate tickers in parallel."""
+        cache_path = self._disk_cache_path(pairs, start_dt, end_dt, interval)
+        cached = self._read_disk_cache(cache_path, interval)
+        if cached is not None:
+            return cached
+        
+        candidates = self._symbol_candidates(pairs)
+        
+        # A ticker that worked for this pair before is tried on its own first
+        df = None
+        known = self._symbol_cache.get(pairs)
+        if known is not None:
+            df = self._download_symbol(known, start_dt, end_dt, interval)
+        
+        probes = [sym for sym in candidates if sym != known]
+        if df is None and probes:
+            executor = ThreadPoolExecutor(max_workers=len(probes))
+            futures = [
+                executor.submit(self._download_symbol, sym, start_dt, end_dt, interval)
+                for sym in probes
+            ]
+            try:
+                # Wait in priority order so an earlier format wins over a later one
+                for sym, future in zip(probes, futures):
+                    df = future.result()
+                    if df is not None:
+                        self._symbol_cache[pairs] = sym
+                        break
+            finally:
+                # Return as soon as a winner is known; slower probes finish in the background
+                executor.shutdown(wait=False, cancel_futures=True)
+        
+        if df is None:
+            raise self._data_not_found(pairs, candidates, start_dt, end_dt, interval)
+        
+        df = self._clean_market_data(df)
+        self._write_disk_cache(cache_path, df)
+        return df
+    
+    def _disk_cache_path(
+        self,
+        pairs: str,
+        start_dt: datetime,
+        end_dt: datetime,
+        interval: str
+    ) -> Path:
+        """Parquet file holding cleaned market data for one pair and range."""
+        key = self._data_key(pairs, start_dt, end_dt, interval)
+        return Path(self.settings.cache_dir).expanduser() / f"{key}.parquet"
+    
+    @staticmethod
+    def _data_key(pairs: str, start_dt: datetime, end_dt: datetime, interval: str) -> str:
+        """Identifier shared by the cached data and exported files for one pair and range."""
+        return hashlib.sha256(
+            f"{pairs}|{start_dt.isoformat()}|{end_dt.isoformat()}|{interval}".encode()
+        ).hexdigest()
+    
+    def _read_disk_cache(self, path: Path, interval: str) -> Optional[pd.DataFrame]:
+        """Load a cached frame, returning None when disabled, missing or expired."""
+        if not self.settings.cache_enabled:
+            return None
+        
+        try:
+            age = time.time() - path.stat().st_mtime
+        except OSError:
+            return None
+        
+        if age > DISK_CACHE_TTL.get(interval, 3600):
+            return None
+        
+        try:
+            df = pd.read_parquet(path)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+            return None
+        
+        self.logger.debug(f"Loaded market data from disk cache: {path}")
+        return df
+    
+    def _write_disk_cache(self, path: Path, df: pd.DataFrame) -> None:
+        """Store a frame in the disk cache; failures only cost a future download."""
+        if not self.settings.cache_enabled:
+            return
+        
+        # Write to a private temp file and rename so readers never see a partial file
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(tmp_path, compression="snappy")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Failed to write cache file {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
+    @staticmethod
+    def _symbol_candidates(pairs: str) -> List[str]:
+        """Yahoo Finance ticker formats to try for a currency pair, in priority order."""
         pair_clean = pairs.upper().replace(' ', '')
         base, quote = pair_clean.split('/')
         
-        candidates = [
+        # dict.fromkeys drops repeated formats while keeping the priority order
+        return list(dict.fromkeys([
             pair_clean.replace('/', '') + '=X',  # EURUSD=X
             base + quote + '=X',                 # EURUSD=X (same)
             quote + base + '=X',                 # USDEUR=X (fallback)
             quote + '=X'                         # sometimes JPY=X works for USD/JPY
-        ]
-        
-        df = None
-        used_symbol = None
+        ]))
+    
+    def _download_symbol(
+        self,
+        sym: str,
+        start_dt: datetime,
+        end_dt: datetime,
+        interval: str
+    ) -> Optional[pd.DataFrame]:
+        """Download one ticker, returning None when it has no data."""
+        import yfinance as yf
         
-        for sym in candidates:
-            try:
-                self.logger.debug(f"Trying to fetch data for symbol: {sym}")
-                df_try = yf.download(
+        try:
+            self.logger.debug(f"Trying to fetch data for symbol: {sym}")
+            with self._download_slots:
+                df = yf.download(
                     sym, 
                     start=start_dt, 
                     end=end_dt, 
@@ -186,31 +501,143 @@ class ChartService(LoggerMixin):
                     auto_adjust=True,
                     timeout=self.settings.yfinance_timeout
                 )
-                
-                if df_try is not None and isinstance(df_try, pd.DataFrame) and not df_try.empty:
-                    df = df_try
-                    used_symbol = sym
-                    self.logger.info(f"Successfully fetched data using symbol: {sym}")
-                    break
-                    
+        except Exception as e:
+            self.logger.warning(f"Failed to download {sym}: {e}")
+            return None
+        
+        if df is None or not isinstance(df, pd.DataFrame) or df.empty:
+            return None
+        
+        self.logger.info(f"Successfully fetched data using symbol: {sym}")
+        return self._normalize_columns(df)
+    
+    @staticmethod
+    def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """Flatten yfinance's (Price, Ticker) columns and keep OHLC prices as float64."""
+        if isinstance(df.columns, pd.MultiIndex):
+            # set_axis relabels without copying the column data or touching the caller's frame
+            df = df.set_axis(df.columns.get_level_values(0), axis=1, copy=False)
+        return df[OHLC_COLUMNS].astype("float64", copy=False)
+    
+    @staticmethod
+    def _data_not_found(
+        pairs: str,
+        candidates: List[str],
+        start_dt: datetime,
+        end_dt: datetime,
+        interval: str
+    ) -> DataNotFoundError:
+        return DataNotFoundError(
+            f"No data found for {pairs}",
+            details={
+                "pairs": pairs,
+                "candidates_tried": candidates,
+                "start_date": start_dt.isoformat(),
+                "end_date": end_dt.isoformat(),
+                "interval": interval
+            }
+        )
+    
+    def _fetch_market_data_batch(
+        self,
+        pairs_list: List[str],
+        start_dt: datetime,
+        end_dt: datetime,
+        interval: str
+    ) -> Dict[str, pd.DataFrame]:
+        """Fetch market data for several pairs using multi-ticker downloads."""
+        frames: Dict[str, pd.DataFrame] = {}
+        cache_paths = {
+            pairs: self._disk_cache_path(pairs, start_dt, end_dt, interval)
+            for pairs in pairs_list
+        }
+        
+        pending = []
+        for pairs in pairs_list:
+            cached = self._read_disk_cache(cache_paths[pairs], interval)
+            if cached is not None:
+                frames[pairs] = cached
+            else:
+                pending.append(pairs)
+        
+        # Every candidate format of every pair goes into the same batched downloads,
+        # except for pairs whose working ticker is already known
+        candidates = {
+            pairs: [self._symbol_cache[pairs]] if pairs in self._symbol_cache
+            else self._symbol_candidates(pairs)
+            for pairs in pending
+        }
+        tickers = list(dict.fromkeys(
+            sym for pairs in pending for sym in candidates[pairs]
+        ))
+        downloaded: Dict[str, pd.DataFrame] = {}
+        failed = set()
+        
+        import yfinance as yf
+        
+        for i in range(0, len(tickers), MAX_SYMBOLS_PER_DOWNLOAD):
+            chunk = tickers[i:i + MAX_SYMBOLS_PER_DOWNLOAD]
+            try:
+                with self._download_slots:
+                    raw = yf.download(
+                        " ".join(chunk),
+                        start=start_dt,
+                        end=end_dt,
+                        interval=interval,
+                        group_by='ticker',
+                        threads=True,
+                        progress=False,
+                        auto_adjust=True,
+                        timeout=self.settings.yfinance_timeout
+                    )
             except Exception as e:
-                self.logger.warning(f"Failed to download {sym}: {e}")
+                self.logger.warning(f"Batch download failed for {chunk}: {e}")
+                failed.update(chunk)
                 continue
+            
+            if raw is None or not isinstance(raw, pd.DataFrame) or raw.empty:
+                continue
+            
+            for sym in chunk:
+                if isinstance(raw.columns, pd.MultiIndex):
+                    if sym not in raw.columns.get_level_values(0):
+                        continue
+                    df = raw[sym]
+                elif len(chunk) == 1:
+                    df = raw
+                else:
+                    continue
+                
+                # The combined index holds rows for every ticker in the chunk
+                df = self._normalize_columns(df).dropna(how='all')
+                if not df.empty:
+                    downloaded[sym] = df
         
-        if df is None or df.empty:
-            raise DataNotFoundError(
-                f"No data found for {pairs}",
-                details={
-                    "pairs": pairs,
-                    "candidates_tried": candidates,
-                    "start_date": start_dt.isoformat(),
-                    "end_date": end_dt.isoformat(),
-                    "interval": interval
-                }
-            )
+        for pairs in pending:
+            # Candidates are in priority order, so the first one with data wins
+            sym = next((sym for sym in candidates[pairs] if sym in downloaded), None)
+            if sym is not None:
+                self._symbol_cache[pairs] = sym
+                frames[pairs] = self._clean_market_data(downloaded[sym])
+                self._write_disk_cache(cache_paths[pairs], frames[pairs])
+            elif failed.intersection(candidates[pairs]) or pairs in self._symbol_cache:
+                # Retry pairs caught in a failed batch, or whose known ticker came back
+                # empty, through the per-pair path that probes every format
+                frames[pairs] = self._fetch_market_data(pairs, start_dt, end_dt, interval)
+            else:
+                raise self._data_not_found(pairs, candidates[pairs], start_dt, end_dt, interval)
         
-        # Remove duplicate timestamps
-        df = df[~df.index.duplicated(keep='first')]
+        return {pairs: frames[pairs] for pairs in pairs_list}
+    
+    def _clean_market_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Remove duplicate timestamps and cap the number of data points."""
+        # Remove duplicate timestamps; yfinance indexes are usually unique already
+        if not df.index.is_unique:
+            df = df[~df.index.duplicated(keep='first')]
+        
+        # Window slicing binary-searches the index, so it must be sorted
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
         
         # Check if we have enough data points
         if len(df) > self.settings.max_data_points:
@@ -225,76 +652,103 @@ class ChartService(LoggerMixin):
         pairs: str, 
         start_dt: datetime, 
         end_dt: datetime, 
-        interval: str
+        interval: str,
+        indicators: Sequence[str] = ()
     ) -> ChartData:
         """Process DataFrame into ChartData model."""
-        candles = []
-        
-        for idx, row in df.iterrows():
-            def safe_float(value):
-                if hasattr(value, 'iloc'):
-                    return float(value.iloc[0])
-                elif pd.isna(value):
-                    return None
-                else:
-                    return float(value)
-            
-            # Skip rows with any NaN values
-            open_val = safe_float(row["Open"])
-            high_val = safe_float(row["High"])
-            low_val = safe_float(row["Low"])
-            close_val = safe_float(row["Close"])
-            
-            if None not in [open_val, high_val, low_val, close_val]:
-                candles.append(CandleData(
-                    time=idx,
-                    open=open_val,
-                    high=high_val,
-                    low=low_val,
-                    close=close_val
-                ))
-        
-        if not candles:
-            raise DataNotFoundError("No valid data points found after processing")
+        # Imported on first use; numba is slow to import and only needed once there is data
+        from .ta_numba import compute_indicators, price_extremes
         
-        # Calculate price range
-        all_prices = []
-        for candle in candles:
-            all_prices.extend([candle.open, candle.high, candle.low, candle.close])
+        df = self._slice_window(df, start_dt, end_dt)
+        index, ohlc = self._ohlc_arrays(df)
         
-        price_range = {
-            "min": min(all_prices),
-            "max": max(all_prices)
-        }
+        # Low bounds and High caps every candle, so one fused pass over those columns is enough
+        lowest, highest = price_extremes(ohlc[:, 2], ohlc[:, 1])
+        price_range = PriceRange(min=float(lowest), max=float(highest))
         
         return ChartData(
             pairs=pairs,
             start_date=df.index.min(),
             end_date=df.index.max(),
             interval=interval,
-            data_points=len(candles),
+            data_points=len(ohlc),
             price_range=price_range,
-            candles=candles
+            times=index.as_unit("ms").asi8,
+            open=ohlc[:, 0],
+            high=ohlc[:, 1],
+            low=ohlc[:, 2],
+            close=ohlc[:, 3],
+            indicators=compute_indicators(
+                indicators, ohlc[:, 0], ohlc[:, 1], ohlc[:, 2], ohlc[:, 3]
+            )
         )
     
+    @staticmethod
+    def _slice_window(df: pd.DataFrame, start_dt: datetime, end_dt: datetime) -> pd.DataFrame:
+        """Rows between start and end inclusive, found by binary search on the sorted index."""
+        start, end = pd.Timestamp(start_dt), pd.Timestamp(end_dt)
+        tz = df.index.tz
+        if tz is not None and start.tzinfo is None:
+            # yfinance reads naive request times in the exchange timezone of the data
+            start = start.tz_localize(tz, ambiguous=True, nonexistent="shift_forward")
+            end = end.tz_localize(tz, ambiguous=True, nonexistent="shift_forward")
+        
+        i0 = df.index.searchsorted(start, side="left")
+        i1 = df.index.searchsorted(end, side="right")
+        return df.iloc[i0:i1]
+    
+    @staticmethod
+    def _ohlc_arrays(df: pd.DataFrame) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """Extract OHLC prices as an (N, 4) float64 array, skipping rows with NaN values."""
+        ohlc = df[OHLC_COLUMNS].to_numpy(dtype=np.float64)
+        index = df.index
+        
+        mask = ~np.isnan(ohlc).any(axis=1)
+        if not mask.all():
+            ohlc = ohlc[mask]
+            index = index[mask]
+        
+        if len(ohlc) == 0:
+            raise DataNotFoundError("No valid data points found after processing")
+        
+        return index, ohlc
+    
+    @classmethod
+    def _ohlc_frame(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """Extract lowercase open/high/low/close columns, skipping rows with NaN values."""
+        index, ohlc = cls._ohlc_arrays(df)
+        return pd.DataFrame(ohlc, index=index, columns=["open", "high", "low", "close"])
+    
+    def _write_csv(self, df: pd.DataFrame, csv_filename: str) -> None:
+        """Export chart data to CSV; runs on the I/O executor."""
+        try:
+            # pyarrow's C++ writer formats whole columns at a time
+            pacsv.write_csv(pa.Table.from_pandas(df.reset_index(), preserve_index=False), csv_filename)
+        except Exception as e:
+            self.logger.error(f"Failed to write CSV export {csv_filename}: {e}")
+    
     def _generate_interactive_chart(
         self, 
         df: pd.DataFrame, 
         pairs: str, 
         start_dt: datetime, 
-        end_dt: datetime
+        end_dt: datetime,
+        interval: str
     ) -> Tuple[Optional[str], Optional[str]]:
         """Generate interactive chart and return URL and CSV filename."""
         try:
-            # Create chart
+            # Imported on first use; it pulls in the webview stack
+            from lightweight_charts import Chart
+            
+            # Create chart from a lowercase OHLC view; NaN rows would break the chart's JSON
             chart = Chart()
-            chart.set(df)
+            chart.set(df.rename(columns=str.lower)[["open", "high", "low", "close"]].dropna())
             
             # Save CSV
-            start_str = start_dt.strftime("%Y%m%d_%H%M")
-            end_str = end_dt.strftime("%Y%m%d_%H%M")
-            csv_filename = f"{pairs.replace('/', '_')}_{start_str}_to_{end_str}_chart_data.csv"
-            df.to_csv(csv_filename)
+            key = self._data_key(pairs, start_dt, end_dt, interval)
+            csv_filename = f"{_pair_slug(pairs)}_{key[:12]}.csv"
+            # The filename is deterministic, so it can be returned before the write finishes
+            self._io_executor.submit(self._write_csv, df, csv_filename)
             
             # Determine chart URL based on environment
             is_windows = platform.system() == 'Windows'
@@ -309,4 +763,10 @@ class ChartService(LoggerMixin):
             
         except Exception as e:
             self.logger.error(f"Failed to generate interactive chart: {e}")
-            return None, None
\ No newline at end of file
+            return None, None
+
+
+@lru_cache(maxsize=1)
+def get_chart_service() -> ChartService:
+    """Shared chart service, so its caches and executors live for the whole process."""
+    return ChartService()
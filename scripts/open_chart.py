@@ -0,0 +1,70 @@
+"""
+Open an interactive candlestick chart in a local window.
+
+Usage:
+    python -m scripts.open_chart "EUR/USD" "2025-08-25 10:00 AM" "2025-08-26 10:00 AM" --interval 15m
+"""
+import argparse
+import os
+import platform
+
+import pandas as pd
+
+from app.models.responses import ChartData
+from lightweight_chart import lightweight_chart
+
+
+def has_display() -> bool:
+    """Whether a chart window can be shown on this machine."""
+    if platform.system() in ("Windows", "Darwin"):
+        return True
+    is_wsl = "microsoft" in platform.uname().release.lower()
+    return is_wsl or bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def chart_frame(chart_data: ChartData) -> pd.DataFrame:
+    """Lowercase OHLC frame indexed by candle time, as lightweight-charts expects."""
+    return pd.DataFrame(
+        {
+            "open": chart_data.open,
+            "high": chart_data.high,
+            "low": chart_data.low,
+            "close": chart_data.close,
+        },
+        index=pd.to_datetime(chart_data.times, unit="ms").rename("time")
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("pairs", help="Currency pair, e.g. EUR/USD")
+    parser.add_argument("start_date_time", help="'YYYY-MM-DD HH:MM AM/PM' or 'YYYY-MM-DD HH:MM'")
+    parser.add_argument("end_date_time", help="'YYYY-MM-DD HH:MM AM/PM' or 'YYYY-MM-DD HH:MM'")
+    parser.add_argument("--interval", default="5m", help="yfinance interval (default: 5m)")
+    args = parser.parse_args()
+
+    chart_data = lightweight_chart(args.pairs, args.start_date_time, args.end_date_time, args.interval).chart_data
+    print(f"📊 Chart created successfully for {chart_data.pairs}")
+    print(f"📈 Data points: {chart_data.data_points}")
+    print(f"💰 Price range: ${chart_data.price_range.min:.5f} - ${chart_data.price_range.max:.5f}")
+
+    # One frame feeds both the CSV export and the chart window
+    frame = chart_frame(chart_data)
+    csv_filename = f"{chart_data.pairs.replace('/', '_')}_{chart_data.start_date:%Y%m%d_%H%M}_{args.interval}.csv"
+    frame.to_csv(csv_filename)
+    print(f"💾 Chart data saved to: {csv_filename}")
+
+    if not has_display():
+        print("🖥️  Headless environment detected - chart data is available in the CSV file above")
+        return
+
+    from lightweight_charts import Chart
+
+    chart = Chart()
+    chart.set(frame)
+    print("🌐 Opening interactive chart... close the window to exit")
+    chart.show(block=True)
+
+
+if __name__ == "__main__":
+    main()
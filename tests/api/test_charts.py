@@ -1,8 +1,9 @@
 """
 Tests for the API endpoints.
 """
+import pandas as pd
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import patch
 
 from app.models.responses import ChartResponse, ChartData, CandleData
 
@@ -42,9 +43,50 @@ class TestChartsAPI:
         assert isinstance(data["intervals"], list)
         assert data["default"] == "5m"
     
+    def test_etag_not_modified(self, client):
+        """Test repeated GET with matching If-None-Match returns 304."""
+        response = client.get("/api/v1/supported-pairs")
+        etag = response.headers["etag"]
+        
+        response = client.get("/api/v1/supported-pairs", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == "public, max-age=86400"
+        assert response.content == b""
+    
+    def test_cache_control_headers(self, client):
+        """Test docs are cacheable and errors are never stored."""
+        response = client.get("/openapi.json")
+        assert response.headers["cache-control"] == "public, max-age=3600"
+        
+        response = client.get("/api/v1/intervals")
+        assert response.headers["cache-control"] == "public, max-age=86400"
+        
+        response = client.get("/api/v1/does-not-exist")
+        assert response.status_code == 404
+        assert response.headers["cache-control"] == "no-store"
+    
+    def test_create_chart_not_modified(self, client, sample_chart_request):
+        """Test chart POST with matching If-None-Match skips chart generation."""
+        from app.api.v1.charts import chart_etag
+        from app.models.requests import ChartRequest
+        
+        etag = chart_etag(ChartRequest(**sample_chart_request), generate_interactive=True)
+        
+        with patch('app.services.chart_service.ChartService.generate_chart_async') as mock_generate:
+            response = client.post(
+                "/api/v1/charts",
+                json=sample_chart_request,
+                headers={"If-None-Match": etag}
+            )
+            
+            assert response.status_code == 304
+            mock_generate.assert_not_called()
+    
     def test_create_chart_success(self, client, sample_chart_request, mock_yfinance_download):
         """Test successful chart creation."""
-        with patch('app.services.chart_service.ChartService.generate_chart') as mock_generate:
+        with patch('app.services.chart_service.ChartService.generate_chart_async') as mock_generate:
             # Mock successful response
             mock_response = ChartResponse(
                 message="Chart created successfully",
@@ -55,7 +97,11 @@ class TestChartsAPI:
                     interval="5m",
                     data_points=100,
                     price_range={"min": 1.1700, "max": 1.1800},
-                    candles=[]
+                    times=[],
+                    open=[],
+                    high=[],
+                    low=[],
+                    close=[]
                 ),
                 chart_url="http://localhost:5500",
                 csv_filename="test.csv",
@@ -66,6 +112,7 @@ class TestChartsAPI:
             response = client.post("/api/v1/charts", json=sample_chart_request)
             
             assert response.status_code == 200
+            assert response.headers["cache-control"] == "public, max-age=60"
             data = response.json()
             assert data["success"] is True
             assert data["chart_data"]["pairs"] == "EUR/USD"
@@ -112,7 +159,7 @@ class TestChartsAPI:
     
     def test_get_chart_data_only(self, client, sample_chart_request, mock_yfinance_download):
         """Test getting chart data without interactive chart."""
-        with patch('app.services.chart_service.ChartService.generate_chart') as mock_generate:
+        with patch('app.services.chart_service.ChartService.generate_chart_async') as mock_generate:
             # Mock successful response without chart URL
             mock_response = ChartResponse(
                 message="Chart data retrieved successfully",
@@ -123,7 +170,11 @@ class TestChartsAPI:
                     interval="5m",
                     data_points=100,
                     price_range={"min": 1.1700, "max": 1.1800},
-                    candles=[]
+                    times=[],
+                    open=[],
+                    high=[],
+                    low=[],
+                    close=[]
                 ),
                 chart_url=None,
                 csv_filename=None,
@@ -139,6 +190,81 @@ class TestChartsAPI:
             assert data["chart_data"]["pairs"] == "EUR/USD"
             assert data["chart_url"] is None
     
+    def test_stream_chart_data(self, client, sample_chart_request, sample_market_data):
+        """Test streaming chart data as newline-delimited JSON."""
+        import json
+        
+        ohlc = sample_market_data.rename(columns=str.lower)
+        
+        with patch('app.services.chart_service.ChartService.get_candles_async') as mock_candles:
+            mock_candles.return_value = ohlc
+            
+            response = client.post("/api/v1/charts/stream", json=sample_chart_request)
+            
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/x-ndjson"
+            lines = response.text.splitlines()
+            assert len(lines) == len(ohlc)
+            first = json.loads(lines[0])
+            assert set(first) == {"time", "open", "high", "low", "close"}
+            assert first["open"] == ohlc["open"].iloc[0]
+    
+    def test_stream_chart_data_trims_to_window(self, client, sample_chart_request, monkeypatch):
+        """Test streamed candles match the requested window when the download is wider."""
+        import json
+        
+        dates = pd.date_range(start='2025-08-25 08:00', end='2025-08-26 12:00', freq='5min')
+        wide = pd.DataFrame(
+            {column: 1.17 for column in ("Open", "High", "Low", "Close")},
+            index=dates
+        )
+        monkeypatch.setattr("yfinance.download", lambda *args, **kwargs: wide.copy())
+        
+        response = client.post("/api/v1/charts/stream", json=sample_chart_request)
+        
+        assert response.status_code == 200
+        times = [json.loads(line)["time"] for line in response.text.splitlines()]
+        # 10:00 AM to 10:00 AM the next day, both ends inclusive
+        assert len(times) == 289
+        assert times[0] == pd.Timestamp("2025-08-25 10:00").value // 10**6
+        assert times[-1] == pd.Timestamp("2025-08-26 10:00").value // 10**6
+    
+    def test_get_chart_data_batch(self, client, sample_chart_request, sample_market_data):
+        """Test batch chart data returns one response per pair, in request order."""
+        request_data = {**sample_chart_request, "pairs_list": ["GBP/USD", "EUR/USD"]}
+        del request_data["pairs"]
+        batch_data = pd.concat(
+            {"EURUSD=X": sample_market_data, "GBPUSD=X": sample_market_data},
+            axis=1
+        )
+        
+        with patch('yfinance.download') as mock_download:
+            mock_download.return_value = batch_data
+            
+            response = client.post("/api/v1/charts/batch", json=request_data)
+        
+        assert response.status_code == 200
+        assert "max-age" in response.headers["cache-control"]
+        data = response.json()
+        assert [item["chart_data"]["pairs"] for item in data] == ["GBP/USD", "EUR/USD"]
+        assert all(item["chart_data"]["data_points"] == len(sample_market_data) for item in data)
+    
+    def test_get_chart_data_batch_empty(self, client, sample_chart_request):
+        """Test batch chart data requires at least one pair."""
+        request_data = {**sample_chart_request, "pairs_list": []}
+        del request_data["pairs"]
+        
+        response = client.post("/api/v1/charts/batch", json=request_data)
+        
+        assert response.status_code == 422  # Validation error
+    
+    def test_cors_allowed_origin(self, client):
+        """Test CORS headers are added for requests with an Origin."""
+        response = client.get("/api/v1/health", headers={"Origin": "http://example.com"})
+        
+        assert response.status_code == 200
+        assert "access-control-allow-origin" in response.headers
+    
     def test_root_endpoint(self, client):
         """Test root endpoint."""
         response = client.get("/")
@@ -154,7 +280,7 @@ class TestChartsAPI:
         """Test chart creation when data not found."""
         from app.core.exceptions import DataNotFoundError
         
-        with patch('app.services.chart_service.ChartService.generate_chart') as mock_generate:
+        with patch('app.services.chart_service.ChartService.generate_chart_async') as mock_generate:
             mock_generate.side_effect = DataNotFoundError(
                 "No data found for EUR/USD",
                 details={"pairs": "EUR/USD"}
@@ -167,9 +293,23 @@ class TestChartsAPI:
             assert "error_code" in data["detail"]
             assert data["detail"]["error_code"] == "DATA_NOT_FOUND"
     
+    def test_create_chart_invalid_date_range(self, client, sample_chart_request):
+        """Test service errors without details are reported with empty details."""
+        from app.core.exceptions import InvalidDateRangeError
+        
+        with patch('app.services.chart_service.ChartService.generate_chart_async') as mock_generate:
+            mock_generate.side_effect = InvalidDateRangeError("Start date must be before end date")
+            
+            response = client.post("/api/v1/charts", json=sample_chart_request)
+            
+            assert response.status_code == 400
+            data = response.json()
+            assert data["detail"]["error_code"] == "INVALID_DATE_RANGE"
+            assert data["detail"]["details"] == {}
+    
     def test_create_chart_internal_error(self, client, sample_chart_request):
         """Test chart creation with internal error."""
-        with patch('app.services.chart_service.ChartService.generate_chart') as mock_generate:
+        with patch('app.services.chart_service.ChartService.generate_chart_async') as mock_generate:
             mock_generate.side_effect = Exception("Internal server error")
             
             response = client.post("/api/v1/charts", json=sample_chart_request)
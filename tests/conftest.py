@@ -1,9 +1,15 @@
 """
 Test configuration and fixtures.
 """
+import os
+
+# Keep the test run from reading or writing the user's Parquet disk cache
+os.environ.setdefault("CACHE_ENABLED", "false")
+
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 import pandas as pd
 from datetime import datetime
 
@@ -30,12 +36,19 @@ def settings():
     return get_settings()
 
 
-@pytest.fixture
-def chart_service():
-    """Create chart service instance."""
+@pytest.fixture(scope="session")
+def shared_chart_service():
+    """Chart service instance built once per test session."""
     return ChartService()
 
 
+@pytest.fixture
+def chart_service(shared_chart_service):
+    """Session chart service with its caches cleared for each test."""
+    shared_chart_service.reset()
+    return shared_chart_service
+
+
 @pytest.fixture
 def sample_chart_request():
     """Sample chart request data."""
@@ -47,7 +60,7 @@ def sample_chart_request():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_market_data():
     """Sample market data DataFrame."""
     dates = pd.date_range(start='2025-08-25 10:00', end='2025-08-26 10:00', freq='5T')
@@ -57,10 +70,17 @@ def sample_market_data():
         'Low': [1.1690 + i * 0.0001 for i in range(len(dates))],
         'Close': [1.1705 + i * 0.0001 for i in range(len(dates))]
     }
-    df = pd.DataFrame(data, index=dates)
+    # Arrow-backed columns, as produced by pandas' pyarrow dtype backend
+    df = pd.DataFrame(data, index=dates).astype("float64[pyarrow]")
     return df
 
 
+@pytest.fixture(autouse=True)
+def no_network(monkeypatch, sample_market_data):
+    """Stub yfinance.download for every test; tests needing other data patch it themselves."""
+    monkeypatch.setattr("yfinance.download", lambda *args, **kwargs: sample_market_data.copy())
+
+
 @pytest.fixture
 def mock_yfinance_download(sample_market_data):
     """Mock yfinance download function."""
@@ -73,6 +93,7 @@ def mock_yfinance_download(sample_market_data):
 def mock_chart_generation():
     """Mock chart generation."""
     with patch('lightweight_charts.Chart') as mock_chart:
-        mock_instance = Mock()
-        mock_chart.return_value = mock_instance
-        yield mock_instance
\ No newline at end of file
+        # Only a stand-in for the window; nothing asserts on its calls
+        chart_instance = SimpleNamespace(set=lambda data: None, show=lambda **kwargs: None)
+        mock_chart.return_value = chart_instance
+        yield chart_instance
\ No newline at end of file
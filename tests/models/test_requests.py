@@ -0,0 +1,82 @@
+"""
+Tests for the request models.
+"""
+import pytest
+from pydantic import ValidationError
+
+from app.models.requests import MAX_BATCH_PAIRS, BatchChartRequest, ChartRequest
+
+
+class TestChartRequestValidation:
+    """Test cases for ChartRequest validation."""
+    
+    def test_valid_request(self):
+        """Test a valid request is normalized."""
+        request = ChartRequest(
+            pairs="eur/usd",
+            start_date_time="2025-08-25 10:00 AM",
+            end_date_time="2025-08-26 10:00",
+            interval="5m"
+        )
+        
+        assert request.pairs == "EUR/USD"
+        assert request.indicators == []
+    
+    @pytest.mark.parametrize("pairs", ["EURUSD", "EUR/US", "INVALID/PAIR", "EUR/USD\n"])
+    def test_invalid_pair(self, pairs):
+        """Test malformed currency pairs are rejected."""
+        with pytest.raises(ValidationError):
+            ChartRequest(
+                pairs=pairs,
+                start_date_time="2025-08-25 10:00 AM",
+                end_date_time="2025-08-26 10:00 AM"
+            )
+    
+    def test_invalid_interval(self):
+        """Test unsupported intervals are rejected."""
+        with pytest.raises(ValidationError):
+            ChartRequest(
+                pairs="EUR/USD",
+                start_date_time="2025-08-25 10:00 AM",
+                end_date_time="2025-08-26 10:00 AM",
+                interval="2m"
+            )
+    
+    @pytest.mark.parametrize("value", ["2025/08/25 10:00", "2025-08-25 13:00 PM", "yesterday"])
+    def test_invalid_datetime_format(self, value):
+        """Test datetimes outside the supported formats are rejected."""
+        with pytest.raises(ValidationError):
+            ChartRequest(
+                pairs="EUR/USD",
+                start_date_time=value,
+                end_date_time="2025-08-26 10:00 AM"
+            )
+    
+    def test_unknown_indicator(self):
+        """Test unsupported indicators are rejected."""
+        with pytest.raises(ValidationError):
+            ChartRequest(
+                pairs="EUR/USD",
+                start_date_time="2025-08-25 10:00 AM",
+                end_date_time="2025-08-26 10:00 AM",
+                indicators=["rsi"]
+            )
+    
+    def test_batch_request_deduplicates_pairs(self):
+        """Test batch pairs are normalized and de-duplicated in order."""
+        request = BatchChartRequest(
+            pairs_list=["gbp/usd", "EUR/USD", "GBP/USD"],
+            start_date_time="2025-08-25 10:00 AM",
+            end_date_time="2025-08-26 10:00 AM"
+        )
+        
+        assert request.pairs_list == ["GBP/USD", "EUR/USD"]
+    
+    def test_batch_request_too_many_pairs(self):
+        """Test batch requests are capped at MAX_BATCH_PAIRS pairs."""
+        with pytest.raises(ValidationError):
+            BatchChartRequest(
+                pairs_list=["EUR/USD"] * (MAX_BATCH_PAIRS + 1),
+                start_date_time="2025-08-25 10:00 AM",
+                end_date_time="2025-08-26 10:00 AM"
+            )
@@ -1,12 +1,17 @@
 """
 Tests for the chart service.
 """
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import patch
 from datetime import datetime
 
 from app.services.chart_service import ChartService
-from app.models.requests import ChartRequest
+from app.models.requests import BatchChartRequest, ChartRequest
 from app.core.exceptions import (
     DataNotFoundError,
     InvalidDateRangeError,
@@ -14,69 +19,128 @@ from app.core.exceptions import (
 )
 
 
+# Shared request range, parsed once here instead of in every test
+START_STR = "2025-08-25 10:00 AM"
+END_STR = "2025-08-26 10:00 AM"
+START_DT = datetime(2025, 8, 25, 10, 0)
+END_DT = datetime(2025, 8, 26, 10, 0)
+
+
+@pytest.fixture(scope="module")
+def eurusd_request():
+    """EUR/USD request validated once for the module; use model_copy for variants."""
+    return ChartRequest(
+        pairs="EUR/USD",
+        start_date_time=START_STR,
+        end_date_time=END_STR,
+        interval="5m"
+    )
+
+
 class TestChartService:
     """Test cases for ChartService."""
     
     def test_parse_date_range_valid(self, chart_service):
         """Test parsing valid date ranges."""
         start_dt, end_dt = chart_service._parse_date_range(
-            "2025-08-25 10:00 AM",
-            "2025-08-26 10:00 AM"
+            START_STR,
+            END_STR
         )
         
-        assert isinstance(start_dt, datetime)
-        assert isinstance(end_dt, datetime)
-        assert start_dt < end_dt
-    
-    def test_parse_date_range_invalid_format(self, chart_service):
-        """Test parsing invalid date format."""
-        with pytest.raises(InvalidDateRangeError):
-            chart_service._parse_date_range(
-                "invalid-date",
-                "2025-08-26 10:00 AM"
-            )
+        assert (start_dt, end_dt) == (START_DT, END_DT)
     
-    def test_parse_date_range_start_after_end(self, chart_service):
-        """Test start date after end date."""
+    @pytest.mark.parametrize("start, end", [
+        ("invalid-date", END_STR),                        # unparseable
+        (END_STR, START_STR),                             # start after end
+        ("2025-01-01 10:00 AM", "2025-12-31 10:00 AM"),   # range too large
+    ])
+    def test_parse_date_range_invalid(self, chart_service, start, end):
+        """Test invalid date ranges are rejected."""
         with pytest.raises(InvalidDateRangeError):
-            chart_service._parse_date_range(
-                "2025-08-26 10:00 AM",
-                "2025-08-25 10:00 AM"
-            )
-    
-    def test_parse_date_range_too_large(self, chart_service):
-        """Test date range too large."""
-        with pytest.raises(InvalidDateRangeError):
-            chart_service._parse_date_range(
-                "2025-01-01 10:00 AM",
-                "2025-12-31 10:00 AM"
-            )
+            chart_service._parse_date_range(start, end)
     
     def test_fetch_market_data_success(self, chart_service, mock_yfinance_download, sample_market_data):
         """Test successful market data fetch."""
-        start_dt = datetime(2025, 8, 25, 10, 0)
-        end_dt = datetime(2025, 8, 26, 10, 0)
+        start_dt = START_DT
+        end_dt = END_DT
         
         df = chart_service._fetch_market_data("EUR/USD", start_dt, end_dt, "5m")
         
         assert not df.empty
         assert len(df) == len(sample_market_data)
-        mock_yfinance_download.assert_called()
+        # Candidate tickers are probed in parallel, so more than one download may run
+        assert mock_yfinance_download.call_count >= 1
+    
+    def test_fetch_market_data_disk_cache(self, chart_service, mock_yfinance_download, tmp_path, monkeypatch):
+        """Test fetched data is written to and served from the Parquet cache."""
+        monkeypatch.setattr(chart_service, "settings", chart_service.settings.model_copy(
+            update={"cache_enabled": True, "cache_dir": str(tmp_path)}
+        ))
+        start_dt = START_DT
+        end_dt = END_DT
+        
+        fetched = chart_service._fetch_market_data("EUR/USD", start_dt, end_dt, "5m")
+        downloads = mock_yfinance_download.call_count
+        cached = chart_service._fetch_market_data("EUR/USD", start_dt, end_dt, "5m")
+        
+        assert len(list(tmp_path.glob("*.parquet"))) == 1
+        assert mock_yfinance_download.call_count == downloads
+        pd.testing.assert_frame_equal(cached, fetched, check_freq=False)
+    
+    def test_symbol_candidates_deduplicated(self, chart_service):
+        """Test ticker formats are unique and keep their priority order."""
+        assert chart_service._symbol_candidates("EUR/USD") == ["EURUSD=X", "USDEUR=X", "USD=X"]
+    
+    def test_fetch_market_data_reuses_known_symbol(self, chart_service, mock_yfinance_download):
+        """Test a pair's working ticker is tried alone on later fetches."""
+        chart_service._fetch_market_data(
+            "EUR/USD", START_DT, END_DT, "5m"
+        )
+        downloads = mock_yfinance_download.call_count
+        
+        chart_service._fetch_market_data(
+            "EUR/USD", END_DT, datetime(2025, 8, 27, 10, 0), "5m"
+        )
+        
+        assert chart_service._symbol_cache["EUR/USD"] == "EURUSD=X"
+        assert mock_yfinance_download.call_count == downloads + 1
+        assert mock_yfinance_download.call_args.args[0] == "EURUSD=X"
+    
+    def test_fetch_market_data_does_not_wait_for_fallbacks(self, chart_service, sample_market_data, monkeypatch):
+        """Test the first ticker with data is returned without waiting on slower probes."""
+        release = threading.Event()
+        
+        def download(sym, **kwargs):
+            if sym != "EURUSD=X":
+                release.wait(5)
+            return sample_market_data
+        
+        monkeypatch.setattr("yfinance.download", download)
+        
+        started = time.monotonic()
+        try:
+            df = chart_service._fetch_market_data("EUR/USD", START_DT, END_DT, "5m")
+            elapsed = time.monotonic() - started
+        finally:
+            release.set()
+        
+        assert len(df) == len(sample_market_data)
+        # The fallback probes block for 5s, so a fast return means nothing waited on them
+        assert elapsed < 2
     
-    def test_fetch_market_data_no_data(self, chart_service):
+    def test_fetch_market_data_no_data(self, chart_service, monkeypatch):
         """Test market data fetch with no data."""
-        with patch('yfinance.download') as mock_download:
-            mock_download.return_value = None
-            
-            with pytest.raises(DataNotFoundError):
-                start_dt = datetime(2025, 8, 25, 10, 0)
-                end_dt = datetime(2025, 8, 26, 10, 0)
-                chart_service._fetch_market_data("INVALID/PAIR", start_dt, end_dt, "5m")
+        monkeypatch.setattr("yfinance.download", lambda *args, **kwargs: None)
+        start_dt = START_DT
+        end_dt = END_DT
+        
+        with pytest.raises(DataNotFoundError):
+            chart_service._fetch_market_data("INVALID/PAIR", start_dt, end_dt, "5m")
     
     def test_process_chart_data(self, chart_service, sample_market_data):
         """Test chart data processing."""
-        start_dt = datetime(2025, 8, 25, 10, 0)
-        end_dt = datetime(2025, 8, 26, 10, 0)
+        start_dt = START_DT
+        end_dt = END_DT
         
         chart_data = chart_service._process_chart_data(
             sample_market_data, "EUR/USD", start_dt, end_dt, "5m"
@@ -86,18 +150,47 @@ class TestChartService:
         assert chart_data.interval == "5m"
         assert chart_data.data_points > 0
         assert len(chart_data.candles) > 0
-        assert "min" in chart_data.price_range
-        assert "max" in chart_data.price_range
+        assert len(chart_data.times) == chart_data.data_points
+        assert len(chart_data.close) == chart_data.data_points
+        assert chart_data.price_range.min <= chart_data.price_range.max
+        assert chart_data.price_range.min == sample_market_data["Low"].min()
     
-    def test_generate_chart_success(self, chart_service, mock_yfinance_download, mock_chart_generation):
-        """Test successful chart generation."""
-        request = ChartRequest(
-            pairs="EUR/USD",
-            start_date_time="2025-08-25 10:00 AM",
-            end_date_time="2025-08-26 10:00 AM",
-            interval="5m"
+    def test_process_chart_data_window(self, chart_service, sample_market_data):
+        """Test only candles inside the requested range are kept."""
+        start_dt = datetime(2025, 8, 25, 12, 0)
+        end_dt = datetime(2025, 8, 25, 13, 0)
+        
+        chart_data = chart_service._process_chart_data(
+            sample_market_data, "EUR/USD", start_dt, end_dt, "5m"
         )
         
+        assert chart_data.data_points == 13
+        assert chart_data.start_date == start_dt
+        assert chart_data.end_date == end_dt
+    
+    def test_process_chart_data_window_exchange_timezone(self, chart_service, sample_market_data):
+        """Test naive request times are read in the timezone of a tz-aware index."""
+        df = sample_market_data.tz_localize("Europe/London")
+        
+        chart_data = chart_service._process_chart_data(df, "EUR/USD", START_DT, END_DT, "5m")
+        
+        assert chart_data.data_points == len(df)
+        assert chart_data.start_date == df.index[0]
+        assert chart_data.end_date == df.index[-1]
+    
+    def test_normalize_columns_multiindex(self, chart_service, sample_market_data):
+        """Test that (Price, Ticker) columns are flattened to float64 OHLC."""
+        df = pd.concat({"EURUSD=X": sample_market_data}, axis=1).swaplevel(axis=1)
+        
+        normalized = chart_service._normalize_columns(df)
+        
+        assert list(normalized.columns) == ["Open", "High", "Low", "Close"]
+        assert (normalized.dtypes == "float64").all()
+    
+    def test_generate_chart_success(self, chart_service, eurusd_request, mock_yfinance_download, mock_chart_generation):
+        """Test successful chart generation."""
+        request = eurusd_request
+        
         response = chart_service.generate_chart(request, generate_interactive=False)
         
         assert response.success is True
@@ -105,14 +198,34 @@ class TestChartService:
         assert response.chart_data.pairs == "EUR/USD"
         assert "metrics" in response.metadata
     
-    def test_generate_chart_with_interactive(self, chart_service, mock_yfinance_download, mock_chart_generation):
+    def test_generate_chart_cached(self, chart_service, eurusd_request, mock_yfinance_download):
+        """Test repeated chart requests are served from the cache."""
+        request = eurusd_request
+        
+        first = chart_service.generate_chart(request, generate_interactive=False)
+        downloads = mock_yfinance_download.call_count
+        second = chart_service.generate_chart(request, generate_interactive=False)
+        
+        assert second is first
+        assert mock_yfinance_download.call_count == downloads
+    
+    @pytest.mark.asyncio
+    async def test_generate_chart_async_falls_back(self, chart_service, eurusd_request, sample_market_data):
+        """Test async generation probes all tickers and uses the first with data."""
+        request = eurusd_request
+        
+        with patch('yfinance.download') as mock_download:
+            mock_download.side_effect = lambda sym, **kwargs: None if sym == "EURUSD=X" else sample_market_data
+            
+            response = await chart_service.generate_chart_async(request, generate_interactive=False)
+        
+        assert response.chart_data.data_points == len(sample_market_data)
+        # Lower-priority probes may be cancelled before they start
+        assert mock_download.call_count >= 2
+    
+    def test_generate_chart_with_interactive(self, chart_service, eurusd_request, mock_yfinance_download, mock_chart_generation):
         """Test chart generation with interactive chart."""
-        request = ChartRequest(
-            pairs="EUR/USD",
-            start_date_time="2025-08-25 10:00 AM",
-            end_date_time="2025-08-26 10:00 AM",
-            interval="5m"
-        )
+        request = eurusd_request
         
         with patch.object(chart_service, '_generate_interactive_chart') as mock_interactive:
             mock_interactive.return_value = ("http://localhost:5500", "test.csv")
@@ -123,17 +236,56 @@ class TestChartService:
             assert response.chart_url is not None
             assert response.csv_filename is not None
     
-    def test_generate_chart_data_not_found(self, chart_service):
+    def test_generate_interactive_chart_writes_csv(
+        self, chart_service, mock_chart_generation, sample_market_data, tmp_path, monkeypatch
+    ):
+        """Test the interactive chart exports its data to CSV in the background."""
+        monkeypatch.chdir(tmp_path)
+        # A private executor, so the test can wait for the write without stopping the shared one
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(chart_service, "_io_executor", executor)
+        
+        chart_url, csv_filename = chart_service._generate_interactive_chart(
+            sample_market_data, "EUR/USD", START_DT, END_DT, "5m"
+        )
+        executor.shutdown(wait=True)
+        
+        assert chart_url is not None
+        assert csv_filename == f"EUR_USD_{chart_service._data_key('EUR/USD', START_DT, END_DT, '5m')[:12]}.csv"
+        exported = pd.read_csv(tmp_path / csv_filename)
+        assert len(exported) == len(sample_market_data)
+        assert {"Open", "High", "Low", "Close"} <= set(exported.columns)
+        assert exported["Close"].iloc[-1] == pytest.approx(sample_market_data["Close"].iloc[-1])
+    
+    def test_generate_chart_data_not_found(self, chart_service, eurusd_request, monkeypatch):
         """Test chart generation with no data found."""
-        request = ChartRequest(
-            pairs="INVALID/PAIR",
-            start_date_time="2025-08-25 10:00 AM",
-            end_date_time="2025-08-26 10:00 AM",
+        request = eurusd_request.model_copy(update={"pairs": "INVALID/PAIR"})
+        
+        monkeypatch.setattr("yfinance.download", lambda *args, **kwargs: None)
+        
+        with pytest.raises(ChartGenerationError):
+            chart_service.generate_chart(request)
+    
+    def test_generate_charts_batch(self, chart_service, sample_market_data):
+        """Test batch chart data uses a single multi-ticker download."""
+        request = BatchChartRequest(
+            pairs_list=["EUR/USD", "GBP/USD"],
+            start_date_time=START_STR,
+            end_date_time=END_STR,
             interval="5m"
         )
+        batch_data = pd.concat(
+            {"EURUSD=X": sample_market_data, "GBPUSD=X": sample_market_data},
+            axis=1
+        )
         
         with patch('yfinance.download') as mock_download:
-            mock_download.return_value = None
+            mock_download.return_value = batch_data
             
-            with pytest.raises(ChartGenerationError):
-                chart_service.generate_chart(request)
\ No newline at end of file
+            responses = chart_service.generate_charts_batch(request)
+        
+        assert mock_download.call_count == 1
+        assert "USDEUR=X" in mock_download.call_args.args[0].split()
+        assert mock_download.call_args.kwargs["threads"] is True
+        assert [r.chart_data.pairs for r in responses] == ["EUR/USD", "GBP/USD"]
+        assert all(r.chart_data.data_points == len(sample_market_data) for r in responses)
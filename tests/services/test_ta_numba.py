@@ -0,0 +1,51 @@
+"""
+Tests for the compiled indicator kernels.
+"""
+import numpy as np
+
+from app.services.ta_numba import compute_indicators, ema, heikin_ashi, price_extremes
+
+
+class TestIndicators:
+    """Test cases for indicator kernels."""
+    
+    def test_heikin_ashi(self, sample_market_data):
+        """Test Heikin-Ashi candles against the textbook recurrence."""
+        o, h, l, c = (sample_market_data[col].to_numpy() for col in ("Open", "High", "Low", "Close"))
+        
+        ha_open, ha_high, ha_low, ha_close = heikin_ashi(o, h, l, c)
+        
+        expected_close = (o + h + l + c) / 4
+        expected_open = np.empty_like(o)
+        expected_open[0] = (o[0] + c[0]) / 2
+        for i in range(1, len(o)):
+            expected_open[i] = (expected_open[i - 1] + expected_close[i - 1]) / 2
+        
+        np.testing.assert_allclose(ha_close, expected_close)
+        np.testing.assert_allclose(ha_open, expected_open)
+        assert (ha_high >= np.maximum(ha_open, ha_close)).all()
+        assert (ha_low <= np.minimum(ha_open, ha_close)).all()
+    
+    def test_ema_matches_pandas(self, sample_market_data):
+        """Test EMA against pandas' recursive exponential weighting."""
+        close = sample_market_data["Close"]
+        
+        result = ema(close.to_numpy(), 20)
+        
+        np.testing.assert_allclose(result, close.ewm(span=20, adjust=False).mean().to_numpy())
+    
+    def test_compute_indicators(self, sample_market_data):
+        """Test indicator series are keyed by output name and aligned with candles."""
+        o, h, l, c = (sample_market_data[col].to_numpy() for col in ("Open", "High", "Low", "Close"))
+        
+        series = compute_indicators(["heikin_ashi", "ema_20"], o, h, l, c)
+        
+        assert set(series) == {"ha_open", "ha_high", "ha_low", "ha_close", "ema_20"}
+        assert all(len(values) == len(c) for values in series.values())
+    
+    def test_price_extremes(self, sample_market_data):
+        """Test the fused reduction matches separate min and max passes."""
+        low = sample_market_data["Low"].to_numpy()
+        high = sample_market_data["High"].to_numpy()
+        
+        assert price_extremes(low, high) == (low.min(), high.max())